@@ -0,0 +1,169 @@
+"""
+Integer traversal kernels over CSR (indptr, indices) graphs.
+
+The kernels only index into buffers handed to them by the caller and never
+allocate, so the same code runs as plain Python or, when numba is installed,
+JIT-compiled to native code. Buffers can be ``array.array``, ``bytearray`` or
+numpy arrays.
+"""
+from typing import Any, Callable, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+def _jit(func: F) -> F:
+    """Compiles a kernel with numba when it is installed, else returns it as is."""
+    if not HAVE_NUMBA:
+        return func
+    return cast(F, njit(cache=True)(func))
+
+
+@_jit
+def tarjan_scc(
+    indptr: Any,
+    indices: Any,
+    n: int,
+    comp: Any,
+    index: Any,
+    low: Any,
+    on_stack: Any,
+    scc_stack: Any,
+    work_nodes: Any,
+    work_edges: Any,
+) -> int:
+    """
+    Iterative Tarjan strongly connected components.
+
+    Args:
+        indptr, indices: Forward CSR adjacency.
+        n: Number of nodes.
+        comp: Output, receives the component id of each node.
+        index: Workspace of n ints, all -1 on entry.
+        low, scc_stack, work_nodes, work_edges: Workspaces of n ints.
+        on_stack: Workspace of n bytes, all 0 on entry.
+
+    Returns:
+        The number of components.
+    """
+    counter = 0
+    n_comp = 0
+    scc_top = 0
+    # Explicit DFS stack of (node, next edge offset) instead of recursion
+    top = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = counter
+        low[root] = counter
+        counter += 1
+        scc_stack[scc_top] = root
+        scc_top += 1
+        on_stack[root] = 1
+        work_nodes[0] = root
+        work_edges[0] = indptr[root]
+        top = 1
+
+        while top > 0:
+            v = work_nodes[top - 1]
+            e = work_edges[top - 1]
+            if e < indptr[v + 1]:
+                work_edges[top - 1] = e + 1
+                w = indices[e]
+                if index[w] == -1:
+                    index[w] = counter
+                    low[w] = counter
+                    counter += 1
+                    scc_stack[scc_top] = w
+                    scc_top += 1
+                    on_stack[w] = 1
+                    work_nodes[top] = w
+                    work_edges[top] = indptr[w]
+                    top += 1
+                elif on_stack[w] == 1 and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            top -= 1
+            if top > 0 and low[v] < low[work_nodes[top - 1]]:
+                low[work_nodes[top - 1]] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    scc_top -= 1
+                    w = scc_stack[scc_top]
+                    on_stack[w] = 0
+                    comp[w] = n_comp
+                    if w == v:
+                        break
+                n_comp += 1
+
+    return n_comp
+
+
+@_jit
+def first_cycle(
+    indptr: Any,
+    indices: Any,
+    n: int,
+    out: Any,
+    color: Any,
+    work_nodes: Any,
+    work_edges: Any,
+) -> int:
+    """
+    Finds one cycle with an iterative white/gray/black DFS.
+
+    Args:
+        indptr, indices: Forward CSR adjacency.
+        n: Number of nodes.
+        out: Output of n ints, receives the cycle's node ids in order.
+        color: Workspace of n bytes, all 0 on entry.
+        work_nodes, work_edges: Workspaces of n ints.
+
+    Returns:
+        The length of the cycle written to ``out``, or 0 if acyclic.
+    """
+    # color: 0 = unvisited, 1 = on the current DFS path, 2 = finished
+    for root in range(n):
+        if color[root] != 0:
+            continue
+        color[root] = 1
+        work_nodes[0] = root
+        work_edges[0] = indptr[root]
+        top = 1
+
+        while top > 0:
+            v = work_nodes[top - 1]
+            e = work_edges[top - 1]
+            if e < indptr[v + 1]:
+                work_edges[top - 1] = e + 1
+                w = indices[e]
+                if color[w] == 0:
+                    color[w] = 1
+                    work_nodes[top] = w
+                    work_edges[top] = indptr[w]
+                    top += 1
+                elif color[w] == 1:
+                    # Back edge v -> w closes the cycle w -> ... -> v; the
+                    # DFS path below v on the stack is exactly that cycle
+                    length = 0
+                    for i in range(top):
+                        if work_nodes[i] == w:
+                            length = top - i
+                            for j in range(length):
+                                out[j] = work_nodes[i + j]
+                            break
+                    return length
+                continue
+
+            color[v] = 2
+            top -= 1
+
+    return 0
@@ -1,6 +1,12 @@
 import logging
+from array import array
+from collections import deque
+from itertools import accumulate, chain, compress, islice
+from operator import eq
 import networkx as nx  # type: ignore
-from typing import List, Set, Dict, Any
+from typing import Iterable, List, Mapping, Optional, Set, Dict, Any, Tuple
+
+from src import _graph_kernels as kernels
 
 logger = logging.getLogger(__name__)
 
@@ -15,15 +21,126 @@ class CircularDependencyError(GraphError):
     pass
 
 
+def _csr_rows(
+    rows: Iterable[Mapping[str, Any]], ids: Dict[str, int]
+) -> Tuple["array[int]", "array[int]"]:
+    """
+    Packs adjacency rows (one neighbor mapping per node, in id order) into
+    CSR (indptr, indices) arrays.
+
+    Row lengths and neighbor ids are streamed through map/accumulate, so no
+    Python-level loop runs per edge, and each row keeps its original order.
+    """
+    rows = list(rows)
+    indptr = array("i", [0])
+    indptr.extend(accumulate(map(len, rows)))
+    indices = array("i", map(ids.__getitem__, chain.from_iterable(rows)))
+    return indptr, indices
+
+
+def _int_buffer(n: int, fill: int = 0) -> "array[int]":
+    """Allocates an int array of length n for the traversal kernels."""
+    return array("i", [fill]) * n
+
+
+class _CsrIndex:
+    """
+    Compressed-sparse-row snapshot of a dependency graph.
+
+    Function names are interned to integer ids; forward (callee) and reverse
+    (caller) adjacency live in flat int arrays, so lookups are slice reads
+    and the traversal kernels work on them directly. The names along a row
+    are frozen into a tuple the first time that row is looked up, so repeat
+    queries only copy it.
+    """
+
+    __slots__ = (
+        "names", "ids", "fwd_indptr", "fwd_indices", "rev_indptr", "rev_indices",
+        "_succ", "_pred",
+    )
+
+    def __init__(self, graph: nx.DiGraph) -> None:
+        # Node ids follow the order adjacency() yields rows in, so forward rows
+        # line up with names without relying on any other iteration order
+        adjacency = list(graph.adjacency())
+        self.names: List[str] = [name for name, _ in adjacency]
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        self.fwd_indptr, self.fwd_indices = _csr_rows(
+            (callees for _, callees in adjacency), self.ids
+        )
+        # Reverse rows are looked up by name, so their order cannot drift
+        self.rev_indptr, self.rev_indices = _csr_rows(
+            map(graph.pred.__getitem__, self.names), self.ids
+        )
+        self._succ: Dict[int, Tuple[str, ...]] = {}
+        self._pred: Dict[int, Tuple[str, ...]] = {}
+
+    def successors(self, node: int) -> Tuple[str, ...]:
+        callees = self._succ.get(node)
+        if callees is None:
+            start, end = self.fwd_indptr[node], self.fwd_indptr[node + 1]
+            callees = tuple(map(self.names.__getitem__, self.fwd_indices[start:end]))
+            self._succ[node] = callees
+        return callees
+
+    def predecessors(self, node: int) -> Tuple[str, ...]:
+        callers = self._pred.get(node)
+        if callers is None:
+            start, end = self.rev_indptr[node], self.rev_indptr[node + 1]
+            callers = tuple(map(self.names.__getitem__, self.rev_indices[start:end]))
+            self._pred[node] = callers
+        return callers
+
+    def cycle_through(self, node: int, comp: "array[int]") -> List[int]:
+        """
+        Returns a shortest cycle through ``node`` within its component.
+        """
+        indptr, indices = self.fwd_indptr, self.fwd_indices
+        target = comp[node]
+        parent = {node: -1}
+        queue = deque([node])
+        while queue:
+            v = queue.popleft()
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if w == node:
+                    path = [v]
+                    while parent[path[-1]] != -1:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return path
+                if w not in parent and comp[w] == target:
+                    parent[w] = v
+                    queue.append(w)
+        return []
+
+
 class DependencyGraph:
     """
     Manages the dependency graph of functions.
-    Uses NetworkX for storage and analysis.
+    Uses NetworkX for storage; queries run on a compact CSR snapshot that is
+    rebuilt lazily after the graph changes.
     """
 
     def __init__(self) -> None:
         """Initialize an empty directed graph."""
         self.graph = nx.DiGraph()
+        self._csr: Optional[_CsrIndex] = None
+        # Digest of the source this graph was built from, set by whoever built
+        # it; any change to the graph resets it to None
+        self.source_digest: Optional[bytes] = None
+
+    def _index(self) -> _CsrIndex:
+        """Returns the CSR snapshot, rebuilding it if the graph changed."""
+        if self._csr is None:
+            self._csr = _CsrIndex(self.graph)
+        return self._csr
+
+    def clear(self) -> None:
+        """Removes all functions and dependencies, reusing this instance."""
+        self.graph.clear()
+        self._csr = None
+        self.source_digest = None
 
     def add_dependency(self, caller: str, callee: str) -> None:
         """
@@ -32,8 +149,16 @@ class DependencyGraph:
         Args:
             caller: The name of the function calling another.
             callee: The name of the function being called.
+
+        The add itself is O(1). A new edge drops the query index, which the
+        next query rebuilds once in O(V + E), however many edges were added in
+        between.
         """
+        self.source_digest = None
+        if self.graph.has_edge(caller, callee):
+            return
         self.graph.add_edge(caller, callee)
+        self._csr = None
 
     def build_from_parsed_data(self, data: List[tuple[str, Set[str]]]) -> None:
         """
@@ -42,25 +167,81 @@ class DependencyGraph:
         Args:
             data: List of tuples (caller, set_of_callees).
         """
-        for caller, callees in data:
-            self.graph.add_node(caller)  # Ensure caller exists even if no callees
-            for callee in callees:
-                self.add_dependency(caller, callee)
+        self.source_digest = None
+        # Batch inserts; callers are added even if they call nothing
+        self.graph.add_nodes_from(caller for caller, _ in data)
+        self.graph.add_edges_from(
+            chain.from_iterable(
+                ((caller, callee) for callee in callees) for caller, callees in data
+            )
+        )
+        # The graph is queried, not mutated, after a build; freeze it now
+        self._csr = _CsrIndex(self.graph)
 
     def detect_cycles(self) -> List[List[str]]:
         """
-        Detects all simple cycles in the graph.
+        Detects circular dependencies in the graph.
+
+        Rather than enumerating every simple cycle (exponential in the worst
+        case), this finds the strongly connected components and reports one
+        witness cycle per cyclic component, which runs in O(V + E).
 
         Returns:
-            A list of cycles, where each cycle is a list of function names.
+            A list of cycles, one per cyclic component, where each cycle is a
+            list of function names.
         """
         try:
-            cycles = list(nx.simple_cycles(self.graph))
-            return cycles  # type: ignore
+            # Most call graphs are acyclic; a plain DFS settles that quickly
+            if not self.first_cycle():
+                return []
+
+            index = self._index()
+            n = len(index.names)
+            comp = _int_buffer(n)
+            n_comp = kernels.tarjan_scc(
+                index.fwd_indptr, index.fwd_indices, n, comp,
+                _int_buffer(n, -1), _int_buffer(n), bytearray(n),
+                _int_buffer(n), _int_buffer(n), _int_buffer(n),
+            )
+
+            sizes = array("i", [0]) * n_comp
+            first = array("i", [-1]) * n_comp
+            for node in range(n):
+                sizes[comp[node]] += 1
+                if first[comp[node]] == -1:
+                    first[comp[node]] = node
+
+            cycles: List[List[str]] = []
+            for c in range(n_comp):
+                node = first[c]
+                start, end = index.fwd_indptr[node], index.fwd_indptr[node + 1]
+                if sizes[c] > 1 or node in index.fwd_indices[start:end]:
+                    witness = index.cycle_through(node, comp)
+                    cycles.append([index.names[i] for i in witness])
+            return cycles
         except Exception as e:
             logger.error(f"Error detecting cycles: {e}")
             raise GraphError(f"Cycle detection failed: {e}")
 
+    def first_cycle(self) -> List[str]:
+        """
+        Returns a single circular dependency, if there is one.
+
+        Cheaper than detect_cycles when only the presence of a cycle matters.
+
+        Returns:
+            The function names along one cycle, or an empty list if the graph
+            is acyclic.
+        """
+        index = self._index()
+        n = len(index.names)
+        cycle = _int_buffer(n)
+        length = kernels.first_cycle(
+            index.fwd_indptr, index.fwd_indices, n, cycle,
+            bytearray(n), _int_buffer(n), _int_buffer(n),
+        )
+        return [index.names[i] for i in cycle[:length]]
+
     def get_downstream_dependencies(self, func_name: str) -> List[str]:
         """
         Returns a list of functions called by the given function (direct children).
@@ -74,10 +255,12 @@ class DependencyGraph:
         Raises:
             GraphError: If the function is not in the graph.
         """
-        if func_name not in self.graph:
+        index = self._index()
+        node = index.ids.get(func_name)
+        if node is None:
             raise GraphError(f"Function '{func_name}' not found in graph.")
         
-        return list(self.graph.successors(func_name))
+        return list(index.successors(node))
 
     def get_upstream_callers(self, func_name: str) -> List[str]:
         """
@@ -92,10 +275,12 @@ class DependencyGraph:
         Raises:
             GraphError: If the function is not in the graph.
         """
-        if func_name not in self.graph:
+        index = self._index()
+        node = index.ids.get(func_name)
+        if node is None:
             raise GraphError(f"Function '{func_name}' not found in graph.")
         
-        return list(self.graph.predecessors(func_name))
+        return list(index.predecessors(node))
 
     def get_all_nodes(self) -> List[str]:
         """Returns all function names in the graph."""
@@ -107,4 +292,9 @@ class DependencyGraph:
         excluding potential root nodes if they are entry points (main).
         But strictly speaking, orphans are those with in-degree 0.
         """
-        return [n for n, d in self.graph.in_degree() if d == 0]
+        index = self._index()
+        indptr = index.rev_indptr
+        # In-degree is zero where consecutive row offsets are equal; compare
+        # the offset array against itself shifted by one, entirely in C
+        no_callers = map(eq, indptr, islice(indptr, 1, None))
+        return list(compress(index.names, no_callers))
@@ -1,16 +1,23 @@
 import logging
-from typing import List, Set, Tuple, Optional
+import sys
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple, Optional, Union
+
+# Logging is configured by the application entry point, not on import
+logger = logging.getLogger(__name__)
+
 try:
     import tree_sitter_cpp as ts_cpp  # type: ignore
-    from tree_sitter import Language, Parser, Node  # type: ignore
+    from tree_sitter import Language, Parser, Node, Query, Tree  # type: ignore
 except ImportError:
     ts_cpp = None
-    Language = Parser = Node = None
-    logging.warning("Failed to import tree-sitter dependencies. Parser will not work.")
+    Language = Parser = Node = Query = Tree = None
+    logger.warning("Failed to import tree-sitter dependencies. Parser will not work.")
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Number of parse trees kept around for incremental re-parsing
+TREE_CACHE_SIZE = 10
 
 
 class ParseError(Exception):
@@ -18,12 +25,34 @@ class ParseError(Exception):
     pass
 
 
+@lru_cache(maxsize=1)
+def _get_cpp_language() -> Language:
+    """Returns the tree-sitter C++ language, loaded once per process."""
+    return Language(ts_cpp.language())
+
+
+@lru_cache(maxsize=1)
+def _get_cpp_query() -> Query:
+    """
+    Returns the compiled definitions/calls query, shared by all parsers.
+
+    Compiling the query costs milliseconds, far more than running it on a
+    typical file, so it is built once per process rather than per parser.
+    """
+    return _get_cpp_language().query(
+        "(function_definition) @func (call_expression function: (_) @callee)"
+    )
+
+
 class CppParser:
     """
     Parses C++ code to extract function definitions and their calls.
 
     Attributes:
         parser (Parser): The tree-sitter parser instance initialized with C++.
+
+    Trees parsed under a ``key`` are cached (LRU, ``TREE_CACHE_SIZE`` entries)
+    so that re-parsing the same key only re-parses the edited region.
     """
 
     def __init__(self) -> None:
@@ -32,18 +61,32 @@ class CppParser:
             raise ParseError("tree-sitter or tree-sitter-cpp not cached/installed correctly.")
 
         try:
-            CPP_LANGUAGE = Language(ts_cpp.language())
-            self.parser = Parser(CPP_LANGUAGE)
+            self._lang = _get_cpp_language()
+            self.parser = Parser(self._lang)
+            self._query = _get_cpp_query()
+            # Encoded source of the parse in progress, see _text()
+            self._src = b""
+            # key -> (source the tree was parsed from, tree); source is None
+            # once the tree has been edited through edit()
+            self._tree_cache: OrderedDict[str, Tuple[Optional[bytes], Tree]] = (
+                OrderedDict()
+            )
         except Exception as e:
             logger.error(f"Failed to initialize tree-sitter parser: {e}")
             raise ParseError(f"Parser initialization failed: {e}")
 
-    def parse_source(self, source_code: str) -> List[Tuple[str, Set[str]]]:
+    def parse_source(
+        self, source_code: Union[str, bytes], key: Optional[str] = None
+    ) -> List[Tuple[str, Set[str]]]:
         """
         Parses C++ source code to find function definitions and the functions they call.
 
         Args:
-            source_code: The C++ source code as a string.
+            source_code: The C++ source code, as a string or UTF-8 bytes.
+                Passing bytes (e.g. straight from a file) skips re-encoding.
+            key: Optional stable identifier for this source (e.g. a file path or
+                session). When given, the previous tree for the key is reused
+                so only the changed region is re-parsed.
 
         Returns:
             A list of tuples, where each tuple contains:
@@ -54,93 +97,195 @@ class CppParser:
             ParseError: If parsing fails unexpectedly.
         """
         try:
-            tree = self.parser.parse(bytes(source_code, "utf8"))
-            root_node = tree.root_node
-            results: List[Tuple[str, Set[str]]] = []
-
-            # Use a Query to find all function definitions anywhere in the tree
-            # This is robust against hierarchy changes caused by syntax errors
-            CPP_LANGUAGE = Language(ts_cpp.language())
-            func_query = CPP_LANGUAGE.query("(function_definition) @func")
-            # captures(node) returns Dict[str, List[Node]] in newer bindings
-            captures = func_query.captures(root_node)
-
-            # Handle both list (older) and dict (newer) return types just in case, 
-            # but based on debug we know it is dict.
-            if isinstance(captures, dict):
-                for name, nodes in captures.items():
-                    for node in nodes:
-                        func_name = self._extract_function_name(node)
-                        if func_name:
-                            calls = self._extract_function_calls(node)
-                            results.append((func_name, calls))
+            # Encode once; identifiers are sliced straight out of this buffer
+            if isinstance(source_code, bytes):
+                src = source_code
             else:
-                 # Fallback if specific version changes
-                 for node, _ in captures:
-                    func_name = self._extract_function_name(node)
-                    if func_name:
-                        calls = self._extract_function_calls(node)
-                        results.append((func_name, calls))
-            
-            return results
+                src = source_code.encode("utf8")
+            self._src = src
+            tree = self._parse_tree(src, key)
+            root_node = tree.root_node
+
+            # One query collects both function definitions and call sites
+            # anywhere in the tree. This is robust against hierarchy changes
+            # caused by syntax errors.
+            captures = self._captures(root_node)
+            func_nodes = sorted(captures.get("func", []), key=lambda n: n.start_byte)
+
+            # Byte ranges of named functions in source order, plus the index of
+            # the closest enclosing named function (-1 at top level)
+            starts: List[int] = []
+            ends: List[int] = []
+            parents: List[int] = []
+            names: List[str] = []
+            call_sets: List[Set[bytes]] = []
+            open_funcs: List[int] = []
+            for node in func_nodes:
+                func_name = self._extract_function_name(node)
+                if not func_name:
+                    continue
+                while open_funcs and ends[open_funcs[-1]] < node.end_byte:
+                    open_funcs.pop()
+                parents.append(open_funcs[-1] if open_funcs else -1)
+                open_funcs.append(len(starts))
+                starts.append(node.start_byte)
+                ends.append(node.end_byte)
+                names.append(func_name)
+                call_sets.append(set())
+
+            # Attribute each callee to the innermost function containing it.
+            # The query captures the call's function node directly, so no
+            # per-call child lookup is needed.
+            for node in captures.get("callee", []):
+                idx = bisect_right(starts, node.start_byte) - 1
+                while idx >= 0 and ends[idx] < node.end_byte:
+                    idx = parents[idx]
+                if idx >= 0:
+                    call_sets[idx].add(self._text(node))
+
+            # Decode only once per distinct callee of each function; interning
+            # lets every occurrence of a name share one string object
+            return [
+                (name, {sys.intern(call.decode("utf8")) for call in calls})
+                for name, calls in zip(names, call_sets)
+            ]
 
         except Exception as e:
             logger.error(f"Error parsing source code: {e}")
             raise ParseError(f"Parsing failed: {e}")
 
-    def _extract_function_name(self, func_def_node: Node) -> Optional[str]:
+    def edit(
+        self,
+        key: str,
+        start_byte: int,
+        old_end_byte: int,
+        new_end_byte: int,
+        start_point: Tuple[int, int],
+        old_end_point: Tuple[int, int],
+        new_end_point: Tuple[int, int],
+    ) -> None:
         """
-        Extracts the function name from a function_definition node.
+        Records a source edit against the cached tree for ``key``.
+
+        Callers that track their own edits can use this instead of relying on
+        parse_source to diff the old and new source. Arguments follow
+        tree-sitter's ``Tree.edit``; points are ``(row, column)`` pairs.
+
+        Raises:
+            ParseError: If no tree is cached for the key.
         """
-        declarator = func_def_node.child_by_field_name("declarator")
-        if not declarator:
-            return None
-        
-        curr = declarator
-        while curr:
-            if curr.type == "identifier":
-                return curr.text.decode("utf8")
-            elif curr.type == "function_declarator":
-                curr = curr.child_by_field_name("declarator")
-            elif curr.type == "parenthesized_declarator":
-                 curr = curr.child_by_field_name("declarator")
-            elif curr.type == "pointer_declarator" or curr.type == "reference_declarator":
-                 curr = curr.child_by_field_name("declarator")
-            elif curr.type == "field_identifier":
-                 return curr.text.decode("utf8")
+        cached = self._tree_cache.get(key)
+        if cached is None:
+            raise ParseError(f"No cached parse tree for key '{key}'.")
+        _, tree = cached
+        tree.edit(
+            start_byte, old_end_byte, new_end_byte,
+            start_point, old_end_point, new_end_point,
+        )
+        self._tree_cache[key] = (None, tree)
+
+    def _parse_tree(self, src: bytes, key: Optional[str]) -> Tree:
+        """
+        Parses ``src``, reusing the cached tree for ``key`` when there is one.
+        """
+        if key is None:
+            return self.parser.parse(src)
+
+        cached = self._tree_cache.pop(key, None)
+        if cached is None:
+            tree = self.parser.parse(src)
+        else:
+            old_src, old_tree = cached
+            if old_src == src:
+                tree = old_tree
             else:
-                break 
-        
-        if declarator.type == "function_declarator":
-             inner_decl = declarator.child_by_field_name("declarator")
-             if inner_decl and inner_decl.type == "qualified_identifier":
-                 return inner_decl.text.decode("utf8")
+                if old_src is not None:
+                    # The old tree must be told what changed, otherwise
+                    # tree-sitter would reuse stale nodes
+                    self._edit_tree(old_tree, old_src, src)
+                tree = self.parser.parse(src, old_tree)
 
-        return None
+        self._tree_cache[key] = (src, tree)
+        while len(self._tree_cache) > TREE_CACHE_SIZE:
+            self._tree_cache.popitem(last=False)
+        return tree
+
+    @staticmethod
+    def _edit_tree(tree: Tree, old_src: bytes, new_src: bytes) -> None:
+        """
+        Applies the single edit spanning the difference between two sources.
+        """
+        limit = min(len(old_src), len(new_src))
+
+        # Binary search on slice equality keeps the comparisons in C
+        lo, hi = 0, limit
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if old_src[:mid] == new_src[:mid]:
+                lo = mid
+            else:
+                hi = mid - 1
+        start = lo
+
+        lo, hi = 0, limit - start
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if old_src[len(old_src) - mid:] == new_src[len(new_src) - mid:]:
+                lo = mid
+            else:
+                hi = mid - 1
+        old_end = len(old_src) - lo
+        new_end = len(new_src) - lo
+
+        def point(src: bytes, offset: int) -> Tuple[int, int]:
+            row = src.count(b"\n", 0, offset)
+            return (row, offset - src.rfind(b"\n", 0, offset) - 1)
 
-    def _extract_function_calls(self, root_node: Node) -> Set[str]:
+        tree.edit(
+            start, old_end, new_end,
+            point(old_src, start), point(old_src, old_end), point(new_src, new_end),
+        )
+
+    def _text(self, node: Node) -> bytes:
+        """
+        Returns the source bytes spanned by a node of the current parse.
         """
-        Extracts names of functions called within a given node scope.
+        return self._src[node.start_byte:node.end_byte]
+
+    def _captures(self, root_node: Node) -> Dict[str, List[Node]]:
         """
-        calls: Set[str] = set()
-        
-        CPP_LANGUAGE = Language(ts_cpp.language())
-        call_query = CPP_LANGUAGE.query("(call_expression) @call")
-        
-        captures = call_query.captures(root_node)
-        
+        Runs the cached query on a node, grouping captured nodes by name.
+        """
+        captures = self._query.captures(root_node)
+        # captures(node) returns Dict[str, List[Node]] in newer bindings;
+        # older ones return a list of (node, capture_name) pairs
         if isinstance(captures, dict):
-            for name, nodes in captures.items():
-                for node in nodes:
-                     func_node = node.child_by_field_name("function")
-                     if func_node:
-                        call_name = func_node.text.decode("utf8")
-                        calls.add(call_name)
-        else:
-            for node, _ in captures:
-                 func_node = node.child_by_field_name("function")
-                 if func_node:
-                    call_name = func_node.text.decode("utf8")
-                    calls.add(call_name)
+            return captures
+
+        grouped: Dict[str, List[Node]] = {}
+        for node, name in captures:
+            grouped.setdefault(name, []).append(node)
+        return grouped
+
+    def _extract_function_name(self, func_def_node: Node) -> Optional[str]:
+        """
+        Extracts the function name from a function_definition node.
 
-        return calls
+        Walks down the declarator chain by hand, unwrapping pointer, reference
+        and parenthesized declarators until it reaches the name.
+        """
+        curr = func_def_node.child_by_field_name("declarator")
+        while curr:
+            node_type = curr.type
+            if node_type in ("identifier", "field_identifier", "qualified_identifier"):
+                return sys.intern(self._text(curr).decode("utf8"))
+            elif node_type in ("function_declarator", "pointer_declarator"):
+                curr = curr.child_by_field_name("declarator")
+            elif node_type in ("reference_declarator", "parenthesized_declarator"):
+                # These hold their inner declarator without a field name
+                count = curr.named_child_count
+                curr = curr.named_child(count - 1) if count else None
+            else:
+                break
+
+        return None
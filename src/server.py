@@ -1,14 +1,14 @@
 from typing import Any, List, Dict
 import argparse
 import asyncio
+import hashlib
 import logging
 import os
 import sys
 from src.parser import CppParser
 from src.graph import DependencyGraph, GraphError, CircularDependencyError
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured in __main__, not on import
 logger = logging.getLogger("mcp_server")
 
 try:
@@ -52,6 +52,8 @@ mcp = FastMCP(
 # Let's assume we maintain one graph state.
 graph_service = DependencyGraph()
 parser_service = CppParser()
+# Stable parse-cache key so repeat analyses only re-parse what changed
+ANALYSIS_SESSION_KEY = "analyze_codebase"
 
 
 @mcp.tool()
@@ -68,21 +70,33 @@ def analyze_codebase(code_content: str) -> str:
         A status message indicating success and node count.
     """
     try:
-        parsed_data = parser_service.parse_source(code_content)
+        # Re-submitting the code the graph was built from skips the parse and
+        # rebuild; the graph drops its digest whenever it is changed
+        src = code_content.encode("utf8")
+        digest = hashlib.blake2b(src, digest_size=16).digest()
+        if digest == graph_service.source_digest:
+            return _analysis_status()
+
+        parsed_data = parser_service.parse_source(src, key=ANALYSIS_SESSION_KEY)
         # Clear previous graph for this simple one-shot analysis model
         # In a multi-file scenario, we'd append or manage sessions.
-        # Here we re-init for simplicity as requested by "scaffold" nature.
-        global graph_service
-        graph_service = DependencyGraph() 
+        # Clearing in place keeps every reference to graph_service valid.
+        graph_service.clear()
         graph_service.build_from_parsed_data(parsed_data)
         
-        node_count = len(graph_service.get_all_nodes())
-        return f"Successfully analyzed codebase. Graph built with {node_count} functions."
+        graph_service.source_digest = digest
+        return _analysis_status()
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
         return f"Error analyzing codebase: {str(e)}"
 
 
+def _analysis_status() -> str:
+    """Builds the analyze_codebase success message for the current graph."""
+    node_count = len(graph_service.get_all_nodes())
+    return f"Successfully analyzed codebase. Graph built with {node_count} functions."
+
+
 @mcp.tool()
 def get_callers(function_name: str) -> str:
     """
@@ -115,6 +129,9 @@ def get_callees(function_name: str) -> str:
 def detect_cycles() -> str:
     """
     Detect circular dependencies in the current call graph.
+
+    Reports one representative cycle for each group of mutually
+    dependent functions.
     """
     try:
         cycles = graph_service.detect_cycles()
@@ -122,7 +139,10 @@ def detect_cycles() -> str:
             return "No circular dependencies detected."
         
         cycle_strs = [" -> ".join(cycle + [cycle[0]]) for cycle in cycles]
-        return f"Circular dependencies detected:\n- " + "\n- ".join(cycle_strs)
+        return (
+            f"Circular dependencies detected in {len(cycles)} group(s):\n- "
+            + "\n- ".join(cycle_strs)
+        )
     except Exception as e:
         return f"Error detecting cycles: {str(e)}"
 
@@ -179,6 +199,8 @@ async def server_card(_: object) -> "JSONResponse":
     )
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     parser = argparse.ArgumentParser(description="LegacyGraph-MCP server")
     parser.add_argument(
         "--transport",
@@ -58,6 +58,7 @@ def test_linear_dependency(parser, graph):
     
     # Verify no cycles
     assert len(graph.detect_cycles()) == 0
+    assert graph.first_cycle() == []
 
 
 # --- Case B: Circular Dependency (A -> B -> A) ---
@@ -82,6 +83,7 @@ def test_circular_dependency(parser, graph):
     # Cycle should involve A and B
     # Cycle format: [['funcA', 'funcB']] or [['funcB', 'funcA']]
     assert any("funcA" in c and "funcB" in c for c in cycles)
+    assert sorted(graph.first_cycle()) == ["funcA", "funcB"]
 
 # --- Case C: Self-Recursion (A -> A) ---
 def test_self_recursion(parser, graph):
@@ -97,10 +99,29 @@ def test_self_recursion(parser, graph):
     # Check for self-loop
     assert len(cycles) == 1
     assert cycles[0] == ["funcA"]
+    assert graph.first_cycle() == ["funcA"]
     
     callers = graph.get_upstream_callers("funcA")
     assert "funcA" in callers
 
+# --- Case C2: Independent Cycles Reported Once Each ---
+def test_one_cycle_per_component(graph):
+    # Two unrelated loops; the dense one has many simple cycles but
+    # should still be reported as a single witness.
+    graph.build_from_parsed_data([
+        ("a", {"b", "c"}),
+        ("b", {"a", "c"}),
+        ("c", {"a", "b"}),
+        ("x", {"y"}),
+        ("y", {"x"}),
+        ("leaf", set()),
+    ])
+
+    cycles = graph.detect_cycles()
+    assert len(cycles) == 2
+    assert sum(set(c) <= {"a", "b", "c"} for c in cycles) == 1
+    assert sum(set(c) == {"x", "y"} for c in cycles) == 1
+
 # --- Case D: Orphan Functions ---
 def test_orphan_functions(parser, graph):
     code = """
@@ -127,6 +148,28 @@ def test_orphan_functions(parser, graph):
     assert "parent" in orphans
     assert "child" not in orphans
 
+# --- Case D2: Raw Bytes Input ---
+def test_parse_bytes_matches_str(parser):
+    code = "void f() { g(); }\nvoid g() {}\n"
+    assert parser.parse_source(code.encode("utf8")) == parser.parse_source(code)
+
+# --- Case D3: Wrapped Declarators ---
+def test_names_behind_pointer_and_reference_declarators(parser):
+    code = """
+    int* Foo::ptr() { a(); }
+    int& Foo::ref() { b(); }
+    const char& plain() { c(); }
+    int (*factory())() { d(); }
+    """
+    parsed = dict(parser.parse_source(code))
+
+    assert parsed == {
+        "Foo::ptr": {"a"},
+        "Foo::ref": {"b"},
+        "plain": {"c"},
+        "factory": {"d"},
+    }
+
 # --- Case E: Invalid Syntax (Dirty C++) ---
 def test_invalid_syntax_handling(parser, graph):
     # Missing semicolon, random text
@@ -155,3 +198,156 @@ def test_invalid_syntax_handling(parser, graph):
     
     graph.build_from_parsed_data(parsed_data)
     # assert "validFunc" in graph.get_downstream_dependencies("anotherValid")
+
+# --- Case F: Incremental Re-parse ---
+def test_incremental_reparse_matches_cold_parse(parser):
+    code = """
+    void helper() {}
+
+    void funcA() {
+        helper();
+    }
+    """
+    edited = code.replace("helper();", "helper();\n        funcB();")
+
+    parser.parse_source(code, key="main.cpp")
+    incremental = parser.parse_source(edited, key="main.cpp")
+
+    assert incremental == CppParser().parse_source(edited)
+    assert ("funcA", {"helper", "funcB"}) in incremental
+
+
+def test_explicit_edit(parser):
+    code = "void f() { g(); }"
+    parser.parse_source(code, key="k")
+
+    # Replace "g" (byte 11) with "hh"
+    parser.edit("k", 11, 12, 13, (0, 11), (0, 12), (0, 13))
+    result = parser.parse_source("void f() { hh(); }", key="k")
+    assert result == [("f", {"hh"})]
+
+    with pytest.raises(ParseError):
+        parser.edit("missing", 0, 0, 0, (0, 0), (0, 0), (0, 0))
+
+# --- Case G: Calls Belong To The Innermost Function ---
+def test_nested_function_calls(parser):
+    code = """
+    void outer() {
+        before();
+        struct Local {
+            void method() {
+                inner();
+            }
+        };
+        after();
+    }
+    """
+    parsed = dict(parser.parse_source(code))
+
+    assert parsed["outer"] == {"before", "after"}
+    assert parsed["method"] == {"inner"}
+
+# --- Case H: Query Index Tracks Later Edits ---
+def test_queries_see_dependencies_added_after_build(graph):
+    graph.build_from_parsed_data([("a", {"b"}), ("b", set())])
+    assert graph.get_downstream_dependencies("b") == []
+
+    graph.add_dependency("b", "a")
+    assert graph.get_downstream_dependencies("b") == ["a"]
+    assert graph.get_upstream_callers("a") == ["b"]
+    assert len(graph.detect_cycles()) == 1
+
+    # New names and repeated edges are picked up by the rebuilt index
+    graph.add_dependency("b", "c")
+    graph.add_dependency("b", "c")
+    assert graph.get_downstream_dependencies("b") == ["a", "c"]
+    assert graph.get_upstream_callers("c") == ["b"]
+    assert graph.get_orphan_functions() == []
+
+
+def test_clear_resets_graph(graph):
+    graph.build_from_parsed_data([("a", {"a"})])
+    assert graph.detect_cycles() == [["a"]]
+
+    graph.clear()
+    assert graph.get_all_nodes() == []
+    assert graph.detect_cycles() == []
+    with pytest.raises(GraphError):
+        graph.get_downstream_dependencies("a")
+
+# --- Case I: analyze_codebase Short-Circuit ---
+@pytest.fixture
+def server():
+    pytest.importorskip("mcp")
+    from src import server as server_module
+
+    server_module.graph_service.clear()
+    yield server_module
+    server_module.graph_service.clear()
+
+
+@pytest.fixture
+def parse_calls(server, monkeypatch):
+    """Records every parse_source call made by the server."""
+    calls = []
+    parse = server.parser_service.parse_source
+
+    def counting_parse(*args, **kwargs):
+        calls.append(args)
+        return parse(*args, **kwargs)
+
+    monkeypatch.setattr(server.parser_service, "parse_source", counting_parse)
+    return calls
+
+
+def test_analyze_skips_unchanged_input(server, parse_calls):
+    code = "void f() { g(); }"
+    first = server.analyze_codebase(code)
+    second = server.analyze_codebase(code)
+
+    assert first == second
+    assert "2 functions" in second
+    assert len(parse_calls) == 1
+
+
+def test_analyze_rebuilds_after_graph_changes(server, parse_calls):
+    code = "void f() { g(); }"
+    server.analyze_codebase(code)
+
+    server.graph_service.clear()
+    assert "2 functions" in server.analyze_codebase(code)
+    assert server.get_callees("f") == "Function 'f' calls: g"
+    assert len(parse_calls) == 2
+
+    server.graph_service.add_dependency("g", "h")
+    server.analyze_codebase(code)
+    assert len(parse_calls) == 3
+    assert server.get_callees("g") == "Function 'g' does not call any other functions."
+
+
+def test_analyze_failure_is_not_cached(server, monkeypatch):
+    code = "void f() { g(); }"
+    server.analyze_codebase(code)
+
+    def failing_build(data):
+        raise GraphError("boom")
+
+    monkeypatch.setattr(server.graph_service, "build_from_parsed_data", failing_build)
+    assert server.analyze_codebase(code + " ").startswith("Error")
+    monkeypatch.undo()
+
+    assert "2 functions" in server.analyze_codebase(code)
+    assert server.get_callees("f") == "Function 'f' calls: g"
+
+
+def test_index_rows_match_networkx(graph):
+    # Callees defined before their callers and edges added by hand, so node
+    # order differs from first-seen caller order
+    graph.build_from_parsed_data([("c", set()), ("b", {"c", "d"}), ("a", {"d", "b"})])
+    graph.add_dependency("d", "a")
+
+    nx_graph = graph.graph
+    for name in nx_graph:
+        callees = list(nx_graph.successors(name))
+        assert graph.get_downstream_dependencies(name) == callees
+        assert graph.get_upstream_callers(name) == list(nx_graph.predecessors(name))
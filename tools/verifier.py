@@ -1,13 +1,32 @@
 
 import asyncio
+import logging
 import os
 import sys
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import List, Optional, Set, Tuple
 
 # Ensure src is in pythonpath
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.server import analyze_codebase, get_callers, get_callees, detect_cycles, get_orphan_functions
+from src.parser import CppParser
+from src.server import graph_service, get_callers, get_callees, detect_cycles, get_orphan_functions
+
+# Per-process parser, created once by each pool worker
+_worker_parser: Optional[CppParser] = None
+
+
+def _init_worker() -> None:
+    global _worker_parser
+    _worker_parser = CppParser()
+
+
+def _parse_file(path: str) -> List[Tuple[str, Set[str]]]:
+    assert _worker_parser is not None
+    with open(path, "rb") as file:
+        return _worker_parser.parse_source(file.read())
+
 
 def run_verification():
     print("=== Starting LegacyGraph-MCP Verification ===")
@@ -19,13 +38,13 @@ def run_verification():
         return
 
     print(f"Reading files from: {data_dir}")
-    full_code = ""
-    for f in os.listdir(data_dir):
-        if f.endswith(".cpp") or f.endswith(".h"):
-            with open(os.path.join(data_dir, f), "r") as file:
-                full_code += file.read() + "\n"
-    
-    print(f"Total Code Size: {len(full_code)} bytes")
+    with os.scandir(data_dir) as entries:
+        paths = [
+            entry.path
+            for entry in entries
+            if entry.is_file() and entry.name.endswith((".cpp", ".h"))
+        ]
+    print(f"Total Files: {len(paths)}")
 
     # --- Ground Truth Definition ---
     EXPECTED_NODES = {
@@ -50,13 +69,20 @@ def run_verification():
     EXPECTED_ORPHANS = {"hidden_backdoor"} # technically 'main' is often an entry point, not orphan.
     
     print("\n--- Step 1: Analyze Codebase ---")
-    result = analyze_codebase(full_code)
-    print(result)
-    
-    if "Error" in result:
-        print("FAILED: Analysis step failed.")
+    # Parse files in parallel, then merge everything into the server's graph
+    try:
+        # Per-file results stream straight into one flat list; no source
+        # text is ever concatenated
+        with ProcessPoolExecutor(initializer=_init_worker) as executor:
+            parsed_data = list(chain.from_iterable(executor.map(_parse_file, paths)))
+        graph_service.clear()
+        graph_service.build_from_parsed_data(parsed_data)
+    except Exception as e:
+        print(f"FAILED: Analysis step failed: {e}")
         sys.exit(1)
 
+    print(f"Graph built with {len(graph_service.get_all_nodes())} functions.")
+
     print("\n--- Step 2: Accuracy Verification ---")
     
     # Check Nodes
@@ -84,7 +110,7 @@ def run_verification():
     print("\nChecking Cycle Detection...")
     cycles = detect_cycles()
     # Expect main_loop recursion
-    # Note: detect_cycles returns a formatted string like "Circular dependencies detected:\n- main_loop -> main_loop"
+    # Note: detect_cycles returns a formatted string like "Circular dependencies detected in 1 group(s):\n- main_loop -> main_loop"
     has_recursion = "main_loop -> main_loop" in cycles
     if has_recursion:
         print("  [OK] Detected 'main_loop' recursion.")
@@ -113,4 +139,5 @@ def run_verification():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     run_verification()